@@ -1,8 +1,6 @@
 import numpy as np
 import pandas as pd
 import scipy.stats as st
-import math
-import random
 import os
 from pathlib import Path
 
@@ -35,6 +33,8 @@ Input:
 
 3. "numToGenerate": Set this to an non negative integer. It determines how many meta variable records are generated
 
+4. "seed": Set this to an integer to make the generation reproducible. With the default value None every run generates different records
+
 
 
 
@@ -57,6 +57,7 @@ constK = -1         //Sets k to a constant value
 constB = -1         //Sets numTwoSidedCables to a constant value
 constO = -1         //Sets numOneSidedCables to a constant value
 constNumSideCables = -1     //Sets numSideCables to a constant value
+seed = None         //Seed for the random number generator (None -> different values on every run)
 With all values set to default this script generates realistic values for the Meta Variables with varying values for k, numTwoSidedCables, numOneSidedCables and numSideCables.
 
 
@@ -70,12 +71,16 @@ constO = -1
 constNumSideCables = -1
 outputPath = ""   #e.g. "C:\\Users\\Name\\Desktop\\meta_data.csv"
 numToGenerate = 300
+seed = None
 
 if (outputPath == ""):
     outputPath = Path(os.path.dirname(os.path.realpath(__file__)))
     outputPath = outputPath / "meta_data.csv"
 ######################################################################
 
+#Random number generator used for the generation
+rng = np.random.default_rng(seed)
+
 
 
 
@@ -87,35 +92,24 @@ if (outputPath == ""):
 # as well as inter-relationships (e.g. numSideCablesInput < 0.8 * bInput)
 # Additionally, when kInput != -1 it must be possible generate numSideCables and numOneSidedCables so that kInput = 2*numTwoSidedCables + numOneSidedCables
 
+#Valid (min, max) values of the input variables
+inputBounds = {"kInput": (1, 198),
+               "bInput": (0, 99),
+               "oInput": (0, 20),
+               "numSideCablesInput": (0, 63)}
+
 def validateInput(kInput:int, bInput:int, oInput:int, numSideCablesInput:int):
-    if(type(kInput) != int or type(bInput) != int or type(oInput) != int or type(numSideCablesInput) != int):
+    if(not all(isinstance(v, int) and not isinstance(v, bool) for v in (kInput, bInput, oInput, numSideCablesInput))):
         raise Exception("At least one input variable is of a wrong type! kInput, bInput, oInput and numSideCablesInput have to be of type int")
     validateMinMaxConstraints(kInput, bInput, oInput, numSideCablesInput)
     validateRelations(kInput, bInput, oInput, numSideCablesInput)
 
 
 def validateMinMaxConstraints(kInput:int, bInput:int, oInput:int, numSideCablesInput:int):
-    #Variable min/max
-    #K 1/198
-    #B 0/99
-    #O 0/20
-    #numSideCables 0/63
-
-    if(kInput != -1):
-        if(kInput < 1 or kInput > 198):
-            raise Exception("kInput is not in the valid range! (0 < kInput <= 198)")
-
-    if(bInput != -1):
-        if(bInput < 0 or bInput > 99):
-            raise Exception("bInput is not in the valid range! (0 <= bInput <= 100)")
-    
-    if(oInput != -1):
-        if(oInput < 0 or oInput > 20):
-            raise Exception("oInput is not in the valid range! (0 <= oInput <= 20)")
-    
-    if(numSideCablesInput != -1):
-        if(numSideCablesInput < 0 or numSideCablesInput > 63):
-            raise Exception("numSideCablesInput is not in the valid range! (0 <= numSideCablesInput <= 63)")
+    values = {"kInput": kInput, "bInput": bInput, "oInput": oInput, "numSideCablesInput": numSideCablesInput}
+    for name, (minVal, maxVal) in inputBounds.items():
+        if(values[name] != -1 and not (minVal <= values[name] <= maxVal)):
+            raise Exception(name + " is not in the valid range! (" + str(minVal) + " <= " + name + " <= " + str(maxVal) + ")")
 
 
 def validateRelations(kInput:int, bInput:int, oInput:int, numSideCablesInput:int):
@@ -156,138 +150,77 @@ def validateRelations(kInput:int, bInput:int, oInput:int, numSideCablesInput:int
 
 
 
+#The counts for B from 0 to 40 extracted from the cleaned Komax Set
+bWeights = np.array([3, 3, 4, 8, 3, 2, 10, 2, 10, 5, 10, 1, 10, 7, 1, 5, 2, 4, 8, 3, 17, 3, 4, 5, 5, 9, 2, 5, 2, 7, 8, 4, 5, 1, 10, 9, 1, 3, 3, 5, 9], dtype=np.float64)
+bProbabilities = bWeights / bWeights.sum()
+
 def sampleInitialBdistribution(numToGenerate):
-    b = []
-    bBins = [i for i in range(0,41)]
-    #The counts for B from 0 to 40 extracted from the cleaned Komax Set
-    bWeights = [3, 3, 4, 8, 3, 2, 10, 2, 10, 5, 10, 1, 10, 7, 1, 5, 2, 4, 8, 3, 17, 3, 4, 5, 5, 9, 2, 5, 2, 7, 8, 4, 5, 1, 10, 9, 1, 3, 3, 5, 9]
-    
     #in 10,5% of the time b is larger than 40 -> and we assume a uniform distribution
     #in the other 89,5% of the time b is smaller than 40 and we assume the distribution described by bWeights
-    for i in range(0,numToGenerate):
-        rnum = random.uniform(0, 1)
-        if(rnum < 0.105):
-            bVal = random.randint(41,99)
-        else:
-            bVal = random.choices(bBins, weights=bWeights)[0]
-        b.append(bVal)
-
-    return b
-
-
-
-def sampleOneSidedGivenKInput(k):
-    o=[]
-    for i in range(0,len(k)):
-        rnum = random.uniform(0, 1)
-        #in round about 0.8 of the instances we have 0 one-sided cables //when k % 2 = 1 then we need an odd number of one-sided cables
-        if(rnum < 0.8):
-            if(k[i] % 2):
-                o.append(1)
-            else:
-                o.append(0)
-        else:
-            val = st.exponpow.rvs(b=0.68, loc=2.00, scale=7.59, size=1)[0]
-            val = round(val)
-            if(val > 20):
-                val = 20
-            if(val > k[i]):
-                val = k[i]
-            elif ((k[i]-val) % 2):
-                val -= 1
-            o.append(val)
-    return o
-
-
-def sampleOneSidedGivenB(b):
-    o=[]
-    for i in range(0,len(b)):
-        rnum = random.uniform(0, 1)
-        #in round about 0.8 of the instances we have 0 one-sided cables
-        if(rnum < 0.8 and b[i] != 0):
-            o.append(0)
-        else:
-            val = st.lomax.rvs(c=5.09, loc=1.00, scale=18.29, size=1)[0]
-            val = round(val)
-            if(val > 20):
-                val = 20
-            if(b[i]< 4 and val > 10):
-                val = 10
-            if(b[i] + val > 99):
-                val = 99 - b[i]
-            o.append(val)
-
-    return o
-
-
-
-
+    mask = rng.random(numToGenerate) < 0.105
+    large = rng.integers(41, 100, size=numToGenerate)
+    small = rng.choice(len(bProbabilities), size=numToGenerate, p=bProbabilities)
 
+    return np.where(mask, large, small).astype(np.int32)
 
 
 
+#Replaces the values selected by mask with integers from [low, high) and only draws as many integers as records are selected
+def integersWhere(mask, values, low, high):
+    values = values.copy()
+    if(np.ndim(high) == 0):
+        values[mask] = rng.integers(low, high, size=np.count_nonzero(mask))
+    else:
+        values[mask] = rng.integers(low, high[mask])
+    return values
 
 
+#Inverse-CDF sampling for the distributions used for numOneSidedCables (same parametrization as scipy.stats.exponpow and scipy.stats.lomax)
+def sampleExponpow(b, loc, scale, size):
+    #F(x) = 1 - exp(1 - exp(x**b))
+    u = rng.random(size)
+    return loc + scale * np.log1p(-np.log1p(-u)) ** (1/b)
 
 
+def sampleLomax(c, loc, scale, size):
+    #F(x) = 1 - (1 + x)**(-c)
+    u = rng.random(size)
+    return loc + scale * ((1 - u) ** (-1/c) - 1)
 
-#Start sequential generation ##############################################################################################################################################
 
-#First validate the input
-validateInput(constK, constB, constO, constNumSideCables) #throws error with description of the cause if input parameters are invalid
+def sampleOneSidedGivenKInput(k):
+    k = np.asarray(k)
+    numToGenerate = len(k)
+    #in round about 0.8 of the instances we have 0 one-sided cables //when k % 2 = 1 then we need an odd number of one-sided cables
+    mask = rng.random(numToGenerate) < 0.8
 
+    val = sampleExponpow(b=0.68, loc=2.00, scale=7.59, size=numToGenerate)
+    val = np.round(val).astype(np.int32)
+    val = np.minimum(val, 20)
+    val = np.minimum(val, k)
+    val -= (k - val) % 2
 
-#Compute B (numTwoSidedCables) and O (numOneSidedCables) Arrays as well as the helper variable K (K = 2*B + O)
+    return np.where(mask, k % 2, val).astype(np.int32)
 
-if(constK != -1 and constB == -1):
-    k = np.full((numToGenerate,), constK)
-    if(constO == -1):
-        o = sampleOneSidedGivenKInput(k)
-    else:
-        o = np.full((numToGenerate,), constO)
-    b = []
-    for i in range(0,numToGenerate):
-        b.append(int((k[i]-o[i])/2))
-
-elif(constK != -1 and constB != -1):
-    k = np.full((numToGenerate,), constK)
-    b = np.full((numToGenerate,), constB)
-    oHelp = constK - 2*constB
-    o = np.full((numToGenerate,), oHelp)
-
-elif(constK == -1 and constB == -1):
-    b = sampleInitialBdistribution(numToGenerate)
-    if(constO == -1):
-        o = sampleOneSidedGivenB(b)
-    else:
-        o = np.full((numToGenerate,), constO)
-    k=[]
-    for i in range(0,numToGenerate):
-        k.append(2*b[i]+o[i])
-
-elif(constK == -1 and constB != -1):
-    b = np.full((numToGenerate,), constB)
-    if(constO == -1):
-        o = sampleOneSidedGivenB(b)
-    else:
-        o = np.full((numToGenerate,), constO)
-    k=[]
-    for i in range(0,numToGenerate):
-        k.append(2*b[i]+o[i])
 
+def sampleOneSidedGivenB(b):
+    b = np.asarray(b)
+    numToGenerate = len(b)
+    #in round about 0.8 of the instances we have 0 one-sided cables
+    mask = (rng.random(numToGenerate) < 0.8) & (b != 0)
 
+    val = sampleLomax(c=5.09, loc=1.00, scale=18.29, size=numToGenerate)
+    val = np.round(val).astype(np.int32)
+    val = np.minimum(val, 20)
+    val = np.where(b < 4, np.minimum(val, 10), val)
+    val = np.minimum(val, 99 - b)
 
-##############numTwoSidedCables DataFrame################
-newBData = pd.DataFrame(b, columns=['numTwoSidedCables'])
+    return np.where(mask, 0, val).astype(np.int32)
 
-print("==Succesfully generated numTwoSidedCables==")
 
 
 
-##############numOneSidedCables DataFrame################
-newOData = pd.DataFrame(o, columns=['numOneSidedCables'])
 
-print("==Succesfully generated numOneSidedCables==")
 
 
 
@@ -297,302 +230,239 @@ print("==Succesfully generated numOneSidedCables==")
 
 
 
-################Compute numHousings###################
-numHousings = []
+#Maximum number of free normal cavities depending on numHousings and numDifferentHousingTypes
+def maxFreeFromNumHousings(numHousings:int):
+    if(numHousings == 1):
+        return 0
+    elif(numHousings == 2):
+        return 15
+    elif(numHousings > 2 and numHousings < 10):
+        return int(15*numHousings - 11)
+    elif(numHousings < 14 and numHousings > 10):
+        return 85
+    else:
+        return 180
 
-def housingFromKWithNoise(k:int):
-    housingVal = -1
-    if(k < 20):
-        noise = np.random.normal(scale=1.5)
-        housingVal  = int(round(0.2*k + noise))
-    elif(k < 71):
-        noise = np.random.normal(scale=2.5)
-        housingVal = int(round(0.2*k + noise))
-    elif(k < 110):
-        noise = np.random.normal(scale = 2.5)
-        val = 10 + noise
-        if(val <= 4.5):
-            val = 5
-        housingVal = int(round(val))
+def maxFreeFromHousingTypes(numHousingTypes:int):
+    if(numHousingTypes == 1):
+        return 18
+    elif(numHousingTypes > 3 and numHousingTypes < 8):
+        return 55
+    elif(numHousingTypes >= 8):
+        return 20
     else:
-        noise = np.random.normal(scale=1.5)
-        housingVal = int(round(10 + noise))
-    if(housingVal <= 1):
-        if(kVal > 6):
-            housingVal = 2
-        else:
-            housingVal = 1
-    return housingVal
+        return 180
 
+#numHousings and numDifferentHousingTypes are at most 18 -> evaluate both functions once for every possible value and look the results up
+maxFreeFromNumHousingsLUT = np.array([maxFreeFromNumHousings(n) for n in range(0,19)], dtype=np.int32)
+maxFreeFromHousingTypesLUT = np.array([maxFreeFromHousingTypes(n) for n in range(0,19)], dtype=np.int32)
 
-for kVal in k:
-    hVal = -1
-    if(kVal == 1):
-        hVal = 1
-        numHousings.append(hVal)
-        continue
-    if(kVal < 5):
-        hVal = random.randint(1,2)
-        numHousings.append(hVal)
-        continue
-    hVal = housingFromKWithNoise(kVal)
-    if(hVal > kVal * 0.5):
-        hVal = math.floor(kVal * 0.5)
-    if(hVal > 18):
-        hVal = 18
-    numHousings.append(hVal)
 
 
-##############numHousings DataFrame################
-newHousingData = pd.DataFrame(numHousings, columns=['numHousings'])
 
-print("==Succesfully generated numHousings==")
 
+#Start sequential generation ##############################################################################################################################################
 
+#First validate the input
+validateInput(constK, constB, constO, constNumSideCables) #throws error with description of the cause if input parameters are invalid
 
 
-#################Compute numSideCables###################
+#Generates numToGenerate meta variable records
+def generateMetaVariables(numToGenerate):
+    #Compute B (numTwoSidedCables) and O (numOneSidedCables) Arrays as well as the helper variable K (K = 2*B + O)
 
-#When constNumSideCables != -1:
-#Works when bInput and constNumSideCable both != -1
-#When bInput not given then numSideCables will be set to constNumSideCables only if constNumSideCables <= 0.8*numTwoSidedCables else it is set to zero
-if(constNumSideCables != -1):
-    numSideCables = []
-    for bVal in b:
-        if(constNumSideCables > 0.8*bVal):
-            numSideCables.append(0)
+    if(constK != -1 and constB == -1):
+        k = np.full((numToGenerate,), constK, dtype=np.int32)
+        if(constO == -1):
+            o = sampleOneSidedGivenKInput(k)
         else:
-            numSideCables.append(constNumSideCables)
-
-else:
-    numSideCables = []
-
-    for i in range(0,numToGenerate):
-        if(numHousings[i] < 3): #numhousings < 3 -> no SideCables possible
-            numSideCables.append(0)
-            continue
-        if(b[i] < 3):          #b < 3 -> no SideCables in the cleanedKomaxSet
-            numSideCables.append(0)
-            continue
-        elif(b[i] < 9):
-            rnum = random.uniform(0, 1)
-            if(rnum < 0.94):         #with ~94% = 0 in cleanedKomaxSet
-                numSideCables.append(0)
-                continue
-            else:
-                numSideCables.append(1)
-                continue
-        elif(b[i] < 18):
-            rnum = random.uniform(0, 1)
-            if(rnum < 0.89):         #with ~89% = 0 in cleanedKomaxSet
-                numSideCables.append(0)
-                continue
-            else:
-                rnum = random.randint(1, 4)
-                numSideCables.append(rnum)
-                continue
-        elif(b[i] < 35):
-            rnum = random.uniform(0, 1) 
-            if(rnum < 0.66):         #with 66% = 0 in cleanedKomaxSet
-                numSideCables.append(0)
-                continue
-            else:
-                rnum = random.randint(1, 16)
-                if(rnum > 0.8*b[i]):
-                    rnum = int(0.8*b[i])
-                numSideCables.append(rnum)
-                continue
-            
-        ######else when b >= 35 we have a linear relationship####### -> we sample with noise from this relationship
-        val = -23.3 + 0.842 * b[i]
-
-        val = int(round(val + np.random.normal(scale=10)))
-
-        if(val > 63):
-            val = random.randint(50,63)
-        if(val > 0.8 * b[i]): # no instance in the cleaned Komax Set has more than 0.8*B  sideCables
-            val = int(0.8*b[i])
-            numSideCables.append(val)
-            continue
-        if((b[i] - val)> 95): #we have no central plug that can take more than 95 two sided cables
-            val = b[i] - 95
-            numSideCables.append(val)
-            continue
-        if(val < 0):
-            val = random.randint(0,10)
-            numSideCables.append(val)
-            continue
-        numSideCables.append(val)
-
-
-##############numSideCables DataFrame################
-newSideData = pd.DataFrame(numSideCables, columns=['numSideCables'])
-
-print("==Succesfully generated numSideCables==")
-
-
-
-
-#####################Compute numDifferentHousingTypes###############################
-numDifferentHousingTypes = []
-for i in range(0,numToGenerate):
-    if(b[i] > 37):
-        noise = int(round(np.random.normal(scale=1)))
-        val = noise + 3
-        if(val < 2):
-            val = 2
-        if(numHousings[i] < val):
-            val = numHousings[i]
-        numDifferentHousingTypes.append(val)
-        continue
-    if(numHousings[i] < 3):
-        randVal = random.randint(1, numHousings[i])
-        numDifferentHousingTypes.append(randVal)
-        continue
-    if(numHousings[i] < 13):
-        randVal = random.randint(2, numHousings[i])
-        numDifferentHousingTypes.append(randVal)
-        continue
-
-    #here we have b[i] <= 37 and numHousings[i] >= 13
-    rnum = random.uniform(0, 1)
-    if(rnum < 0.9):
-        noise = int(round(np.random.normal(scale=1)))
-        randVal = noise + 8
-        if(numHousings[i] < randVal):
-            randVal = numHousings[i]
-        numDifferentHousingTypes.append(randVal)
-        continue
-    else:
-        randVal = random.randint(2,6)
-        numDifferentHousingTypes.append(randVal)
-
-
-##############numDifferentHousingTypes DataFrame################
-newHTypesData = pd.DataFrame(numDifferentHousingTypes, columns=['numDifferentHousingTypes'])
-
-print("==Successfully generated numDifferentHousingTypes==")
-
-
+            o = np.full((numToGenerate,), constO, dtype=np.int32)
+        b = ((k - o) // 2).astype(np.int32)
+
+    elif(constK != -1 and constB != -1):
+        k = np.full((numToGenerate,), constK, dtype=np.int32)
+        b = np.full((numToGenerate,), constB, dtype=np.int32)
+        oHelp = constK - 2*constB
+        o = np.full((numToGenerate,), oHelp, dtype=np.int32)
+
+    elif(constK == -1 and constB == -1):
+        b = sampleInitialBdistribution(numToGenerate)
+        if(constO == -1):
+            o = sampleOneSidedGivenB(b)
+        else:
+            o = np.full((numToGenerate,), constO, dtype=np.int32)
+        k = (2*b + o).astype(np.int32)
 
+    elif(constK == -1 and constB != -1):
+        b = np.full((numToGenerate,), constB, dtype=np.int32)
+        if(constO == -1):
+            o = sampleOneSidedGivenB(b)
+        else:
+            o = np.full((numToGenerate,), constO, dtype=np.int32)
+        k = (2*b + o).astype(np.int32)
 
-#####################Compute numFreeCentralCavs###################################
-numFreeCentralCavs = []
 
 
-for i in range(0,numToGenerate):
-    if (k[i]<6):
-        rnum = random.uniform(0, 1)
-        if(rnum < 0.75):
-            randVal = random.randint(0,19)
-        else:
-            randVal = random.randint(20,39)
-    elif (k[i] < 70):
-        randVal = random.randint(0, 47)
-    elif (k[i] < 86):
-        randVal = random.randint(0,19)
-    else:
-        randVal = random.randint(0,14)
-    if(numDifferentHousingTypes[i] == 1 and randVal > 14):
-        randVal = random.randint(0,14)
-    elif(numDifferentHousingTypes[i] > 7 and randVal < 18):
-        randVal = random.randint(18,47)
-
-    if(numHousings[i] == 1):
-        if(randVal + k[i] > 95):
-            randVal = 95 - k[i]
-            if(randVal < 0):
-                raise Exception("Only one Housing and more than 95 insertion jobs not possible!!!!")
-            if(randVal > 12):
-                randVal = random.randint(0,10)
-    elif (numHousings[i] > 10 and numHousings[i] < 14):
-        if(randVal < 10):
-            rnum = random.uniform(0, 1)
-            if(rnum < 0.9):
-                randVal = random.randint(10,40)
-    else:
-        if(randVal + (b[i]-numSideCables[i]) > 95):
-            randVal = 95 - (b[i] - numSideCables[i])
-            if(randVal < 0):
-                raise Exception("Too many two sided cables connected to the central plug!!!!")
-    
-    numFreeCentralCavs.append(randVal)
+    ################Compute numHousings###################
+    #housings from k with noise
+    sigma = np.select([k < 20, k < 110], [1.5, 2.5], default=1.5)
+    val = np.where(k < 71, 0.2*k, 10) + rng.standard_normal(numToGenerate) * sigma
+    val = np.where((k >= 71) & (k < 110) & (val <= 4.5), 5, val)
+    numHousings = np.round(val).astype(np.int32)
+    numHousings = np.where(numHousings <= 1, np.where(k > 6, 2, 1), numHousings)
+    numHousings = np.minimum(numHousings, np.floor(k * 0.5).astype(np.int32))
+    numHousings = np.minimum(numHousings, 18)
+    numHousings = integersWhere(k < 5, numHousings, 1, 3)
+    numHousings = np.where(k == 1, 1, numHousings).astype(np.int32)
 
 
-##############numFreeCentralCavs DataFrame################
-newFreeCentralCavData = pd.DataFrame(numFreeCentralCavs, columns=['numFreeCentralCavs'])
 
-print("==Succesfully generated numFreeCentralCavs==")
+    #################Compute numSideCables###################
 
+    #When constNumSideCables != -1:
+    #Works when bInput and constNumSideCable both != -1
+    #When bInput not given then numSideCables will be set to constNumSideCables only if constNumSideCables <= 0.8*numTwoSidedCables else it is set to zero
+    maxSideCables = (0.8*b).astype(np.int32) #no instance in the cleaned Komax Set has more than 0.8*B  sideCables
 
+    if(constNumSideCables != -1):
+        numSideCables = np.where(constNumSideCables > 0.8*b, 0, constNumSideCables).astype(np.int32)
 
-#####################Compute numFreeNormalCavs#####################################
-def maxFreeFromNumHousings(numHousings:int):
-    if(numHousings == 1):
-        return 0
-    elif(numHousings == 2):
-        return 15
-    elif(numHousings > 2 and numHousings < 10):
-        return int(15*numHousings - 11)
-    elif(numHousings < 14 and numHousings > 10):
-        return 85
     else:
-        return 180
+        rnum = rng.random(numToGenerate)
+
+        ######when b >= 35 we have a linear relationship####### -> we sample with noise from this relationship
+        val = -23.3 + 0.842 * b
+        val = np.round(val + rng.standard_normal(numToGenerate) * 10).astype(np.int32)
+        val = integersWhere(val > 63, val, 50, 64)
+        val = np.select([val > 0.8*b,                   #no instance in the cleaned Komax Set has more than 0.8*B  sideCables
+                         (b - val) > 95,                #we have no central plug that can take more than 95 two sided cables
+                         val < 0],
+                        [maxSideCables,
+                         b - 95,
+                         rng.integers(0, 11, size=numToGenerate)],
+                        default=val)
+
+        numSideCables = np.select([numHousings < 3,     #numhousings < 3 -> no SideCables possible
+                                   b < 3,               #b < 3 -> no SideCables in the cleanedKomaxSet
+                                   b < 9,               #with ~94% = 0 in cleanedKomaxSet
+                                   b < 18,              #with ~89% = 0 in cleanedKomaxSet
+                                   b < 35],             #with 66% = 0 in cleanedKomaxSet
+                                  [0,
+                                   0,
+                                   np.where(rnum < 0.94, 0, 1),
+                                   np.where(rnum < 0.89, 0, rng.integers(1, 5, size=numToGenerate)),
+                                   np.where(rnum < 0.66, 0, np.minimum(rng.integers(1, 17, size=numToGenerate), maxSideCables))],
+                                  default=val).astype(np.int32)
+
+
+
+    #####################Compute numDifferentHousingTypes###############################
+    noise = np.round(rng.standard_normal(numToGenerate)).astype(np.int32)
+    rnum = rng.random(numToGenerate)
+
+    #used where b <= 37 and numHousings >= 13
+    manyHousingsVal = np.where(rnum < 0.9,
+                               np.minimum(noise + 8, numHousings),
+                               rng.integers(2, 7, size=numToGenerate))
+
+    numDifferentHousingTypes = np.select([b > 37,
+                                          numHousings < 3,
+                                          numHousings < 13],
+                                         [np.minimum(np.maximum(noise + 3, 2), numHousings),
+                                          rng.integers(1, numHousings + 1),
+                                          rng.integers(2, np.maximum(numHousings, 2) + 1)],
+                                         default=manyHousingsVal).astype(np.int32)
+
+
+
+    #####################Compute numFreeCentralCavs###################################
+    rnum = rng.random(numToGenerate)
+    randVal = np.select([k < 6,
+                         k < 70,
+                         k < 86],
+                        [np.where(rnum < 0.75, rng.integers(0, 20, size=numToGenerate), rng.integers(20, 40, size=numToGenerate)),
+                         rng.integers(0, 48, size=numToGenerate),
+                         rng.integers(0, 20, size=numToGenerate)],
+                        default=rng.integers(0, 15, size=numToGenerate))
+
+    randVal = integersWhere((numDifferentHousingTypes == 1) & (randVal > 14), randVal, 0, 15)
+    randVal = integersWhere((numDifferentHousingTypes > 7) & (randVal < 18), randVal, 18, 48)
+
+    #only one housing -> all insertion jobs go to the central plug
+    oneHousing = numHousings == 1
+    tooMany = oneHousing & (randVal + k > 95)
+    randVal = np.where(tooMany, 95 - k, randVal)
+    if((randVal[tooMany] < 0).any()):
+        raise Exception("Only one Housing and more than 95 insertion jobs not possible!!!!")
+    randVal = integersWhere(tooMany & (randVal > 12), randVal, 0, 11)
+
+    #between 11 and 13 housings
+    fewFree = (numHousings > 10) & (numHousings < 14) & (randVal < 10) & (rng.random(numToGenerate) < 0.9)
+    randVal = integersWhere(fewFree, randVal, 10, 41)
+
+    #otherwise only the two sided cables that are no side cables go to the central plug
+    centralTwoSided = b - numSideCables
+    tooMany = ~oneHousing & ~((numHousings > 10) & (numHousings < 14)) & (randVal + centralTwoSided > 95)
+    randVal = np.where(tooMany, 95 - centralTwoSided, randVal)
+    if((randVal[tooMany] < 0).any()):
+        raise Exception("Too many two sided cables connected to the central plug!!!!")
+
+    numFreeCentralCavs = randVal.astype(np.int32)
+
+
+
+    #####################Compute numFreeNormalCavs#####################################
+    numMaxFromNumH = maxFreeFromNumHousingsLUT[numHousings]
+    numMaxFromHTypes = maxFreeFromHousingTypesLUT[numDifferentHousingTypes]
+
+    neededNormalCavs = numSideCables + b + o # = 2*numSideCables + (b - numSideCables) + o
+    neededcentralCavs = b - numSideCables + numFreeCentralCavs
+
+    rnum = rng.random(numToGenerate)
+    igVal = np.round(st.invgauss.rvs(mu=4.09, loc=-0.41, scale=1.51, size=numToGenerate, random_state=rng)).astype(np.int32)
+    igVal = integersWhere((igVal > 20) | (igVal < 0), igVal, 0, 21)
+
+    #used where neededNormalCavs < 40
+    fewNeededVal = np.select([rnum < 0.85,
+                              rnum < 0.95],
+                             [igVal,
+                              rng.integers(21, 41, size=numToGenerate)],
+                             default=rng.integers(41, 181, size=numToGenerate))
+
+    randVal = np.select([neededNormalCavs < 40,
+                         neededNormalCavs < 66,
+                         neededNormalCavs < 120],
+                        [fewNeededVal,
+                         rng.integers(16, 161, size=numToGenerate),
+                         rng.integers(0, 141, size=numToGenerate)],
+                        default=rng.integers(0, 71, size=numToGenerate)) #zwischen 120 und 0
+    randVal = integersWhere((k < 6) & (randVal > 16), randVal, 0, 17)
+    randVal = integersWhere(randVal > numMaxFromNumH, randVal, 0, numMaxFromNumH + 1)
+    randVal = integersWhere(randVal > numMaxFromHTypes, randVal, 0, numMaxFromHTypes + 1)
+    randVal = np.minimum(randVal, 260 - neededcentralCavs - neededNormalCavs)
 
-def maxFreeFromHousingTypes(numHousingTypes:int):
-    if(numHousingTypes == 1):
-        return 18
-    elif(numHousingTypes > 3 and numHousingTypes < 8):
-        return 55
-    elif(numHousingTypes >= 8):
-        return 20
-    else:
-        return 180
+    numFreeNormalCavs = randVal.astype(np.int32)
 
-numFreeNormalCavs = []
-for i in range(0,numToGenerate):
-    neededNormalCavs = numSideCables[i] + b[i] + o[i] # = 2*numSideCables[i] + (b[i] - numSideCables[i]) + o[i]
-    neededcentralCavs = b[i]-numSideCables[i] + numFreeCentralCavs[i]
-    if(neededNormalCavs < 40):
-        rnum = random.uniform(0, 1)
-        if(rnum < 0.85):
-            randVal = st.invgauss.rvs(mu=4.09, loc=-0.41, scale=1.51, size=1)[0]
-            randVal = round(randVal)
-            if(randVal > 20 or randVal < 0):
-                randVal = random.randint(0,20)
-        elif(rnum < 0.95):
-            randVal = random.randint(21,40)
-        else:
-            randVal = random.randint(41,180)
-    elif(neededNormalCavs < 66):
-        randVal = random.randint(16,160)
-    elif(neededNormalCavs < 120):
-        randVal = random.randint(0,140)
-    else: #zwischen 120 und 0
-        randVal = random.randint(0,70)
-    if(k[i] < 6 and randVal > 16):
-        randVal = random.randint(0,16)
-    numMaxFromNumH = maxFreeFromNumHousings(numHousings[i])
-    numMaxFromHTypes = maxFreeFromHousingTypes(numDifferentHousingTypes[i])
-    if(randVal > numMaxFromNumH):
-        randVal = random.randint(0,numMaxFromNumH)
-    if(randVal > numMaxFromHTypes):
-        randVal = random.randint(0,numMaxFromHTypes)
-    if(randVal + neededcentralCavs + neededNormalCavs > 260):
-        randVal = 260 - neededcentralCavs - neededNormalCavs
+    return b, o, numSideCables, numHousings, numDifferentHousingTypes, numFreeCentralCavs, numFreeNormalCavs
 
-    numFreeNormalCavs.append(randVal)
 
 
-##############numFreeNormalCavs DataFrame################
-newFreeNormalCavData = pd.DataFrame(numFreeNormalCavs, columns=['numFreeNormalCavs'])
+#The records are generated in chunks so that the intermediate arrays of a generation step stay small
+chunkSize = 65536
+result = {name: np.empty(numToGenerate, dtype=np.int32) for name in ['numTwoSidedCables', 'numOneSidedCables', 'numSideCables', 'numHousings',
+                                                                      'numDifferentHousingTypes', 'numFreeCentralCavs', 'numFreeNormalCavs']}
+for start in range(0, numToGenerate, chunkSize):
+    end = min(start + chunkSize, numToGenerate)
+    for name, values in zip(result, generateMetaVariables(end - start)):
+        result[name][start:end] = values
 
-print("==Succesfully generated numFreeNormalCavs==")
+for name in result:
+    print("==Succesfully generated " + name + "==")
 
 
 
 #Output
-newResult = pd.concat([newBData, newOData, newSideData, newHousingData, newHTypesData, newFreeCentralCavData, newFreeNormalCavData], axis=1)
+newResult = pd.DataFrame(result)
 
 
 newResult.to_csv(outputPath, sep=';', index=False)
\ No newline at end of file